@@ -3,11 +3,15 @@
 
 from __future__ import annotations
 
+import locale
 import os
+import queue
+import re
+import selectors
 import subprocess
 import sys
 import threading
-from typing import Optional
+from typing import Iterator, Optional
 
 try:
     import tkinter as tk
@@ -26,6 +30,8 @@ from yt_playlist_core import (
     PlaylistTrackProgress,
     build_yt_dlp_command,
     ensure_output_dir,
+    get_js_runtime_args,
+    get_yt_dlp_cmd,
     is_youtube_url,
     load_config,
     parse_progress_line,
@@ -33,8 +39,29 @@ from yt_playlist_core import (
 )
 
 
+# Worker → UI message queue: how often it is drained and how many messages per tick
+_POLL_MS = 50
+_POLL_BATCH = 500
+# Cap on queued messages: a worker that outpaces the UI blocks instead of growing memory
+_MSG_Q_MAX = 20 * _POLL_BATCH
+
+# Bytes per os.read() on yt-dlp's stdout pipe; seconds to wait for output before re-checking Stop
+_READ_CHUNK = 65536
+_READ_TIMEOUT = 0.25
+# yt-dlp writes to a pipe in the locale's preferred encoding (what text=True would decode with)
+_PIPE_ENCODING = locale.getpreferredencoding(False)
+# Same line breaks as a text=True pipe: \r\n, \r or \n (not the extra ones str.splitlines knows)
+_LINE_BREAK_RE = re.compile(rb"\r\n|\r|\n")
+
+# Activity log history cap: once above MAX lines, drop the oldest TRIM lines
+_LOG_MAX_LINES = 5000
+_LOG_TRIM_LINES = 1000
+
+# Progress bar: skip forward steps smaller than this many percent (_poll_queue already limits the rate)
+_PCT_MIN_DELTA = 0.5
+
 # Placeholder shown in URL entry until user focuses
-PLACEHOLDER_URL = "https://music.youtube.com/playlist?list=..."
+PLACEHOLDER_URL = sys.intern("https://music.youtube.com/playlist?list=...")
 
 # UI palette (light theme, high contrast log)
 _COL = {
@@ -53,6 +80,24 @@ _COL = {
 }
 
 
+def _decode_lines(data: bytes) -> list[str]:
+    """Split raw pipe output on CRLF, CR or LF only, then decode each line."""
+    parts = _LINE_BREAK_RE.split(data)
+    if parts and not parts[-1]:
+        parts.pop()
+    return [part.decode(_PIPE_ENCODING, errors="replace") for part in parts]
+
+
+def _take_lines(buf: bytearray) -> list[str]:
+    """Remove complete lines (ending in a newline or carriage return) from buf and return them decoded."""
+    end = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+    if end < 0:
+        return []
+    complete = bytes(buf[: end + 1])
+    del buf[: end + 1]
+    return _decode_lines(complete)
+
+
 def _default_font_family() -> str:
     try:
         return tkfont.nametofont("TkDefaultFont").actual()["family"]
@@ -88,10 +133,18 @@ class PlaylistMP3App:
         self.download_running = False
         self.process = None
         self._playlist_track_progress: Optional[PlaylistTrackProgress] = None
+        self._last_pct = -1.0
+        self._config = load_config()
         self._ff = _default_font_family()
+        # (kind, payload) tuples from the download thread; drained on the Tk thread by _poll_queue
+        self._msg_q: queue.Queue = queue.Queue(maxsize=_MSG_Q_MAX)
+        # (url, output_dir, bitrate) jobs for the long-lived download worker
+        self._jobs: queue.Queue = queue.Queue()
 
         self._apply_style()
         self._build_ui()
+        self.root.after(_POLL_MS, self._poll_queue)
+        threading.Thread(target=self._worker_loop, daemon=True).start()
 
     def _apply_style(self) -> None:
         style = ttk.Style(self.root)
@@ -188,13 +241,14 @@ class PlaylistMP3App:
         url_entry.pack(fill=tk.X, pady=(4, 0))
         url_entry.delete(0, tk.END)
         url_entry.insert(0, PLACEHOLDER_URL)
+        self._placeholder_shown = True
         url_entry.bind("<FocusIn>", lambda e: self._clear_placeholder(url_entry))
 
         out_card = ttk.LabelFrame(main, text="OUTPUT", padding=(14, 12))
         out_card.pack(fill=tk.X, pady=(0, 12))
         row = ttk.Frame(out_card, style="Inner.TFrame")
         row.pack(fill=tk.X)
-        self.path_var = tk.StringVar(value=load_config().get("output_dir", ""))
+        self.path_var = tk.StringVar(value=self._config.get("output_dir", ""))
         path_entry = ttk.Entry(row, textvariable=self.path_var, width=50)
         path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
         ttk.Button(row, text="Browse…", style="Ghost.TButton", command=self._browse).pack(side=tk.LEFT)
@@ -265,7 +319,7 @@ class PlaylistMP3App:
         self._log("")
 
         self._build_menubar()
-        self.root.after(150, self._show_startup_dependency_help)
+        self.root.after(0, self._start_startup_checks)
 
     def _build_menubar(self) -> None:
         menubar = tk.Menu(self.root)
@@ -325,24 +379,34 @@ class PlaylistMP3App:
         ttk.Button(btn_row, text="Copy to clipboard", command=copy_all).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(btn_row, text="Close", style="Ghost.TButton", command=win.destroy).pack(side=tk.RIGHT)
 
-    def _show_startup_dependency_help(self) -> None:
-        issues = collect_dependency_issues()
-        if issues:
-            self._show_dependency_dialog(issues)
+    def _start_startup_checks(self) -> None:
+        """Resolve yt-dlp / JS runtime and check dependencies off the Tk thread so the window paints first."""
+        threading.Thread(target=self._run_startup_checks, daemon=True).start()
+
+    def _run_startup_checks(self) -> None:
+        # Warm the cached lookups so the first download does not pay for PATH scans / yt_dlp import
+        get_yt_dlp_cmd()
+        get_js_runtime_args()
+        self._msg_q.put(("deps", collect_dependency_issues()))
 
     def _clear_placeholder(self, entry: ttk.Entry):
-        if entry.get().strip() == PLACEHOLDER_URL:
+        if self._placeholder_shown:
+            self._placeholder_shown = False
             entry.delete(0, tk.END)
 
     def _browse(self):
         path = filedialog.askdirectory(title="Choose folder for MP3 files")
         if path:
             self.path_var.set(path)
-            save_config(load_config() | {"output_dir": path})
+            self._config["output_dir"] = path
+            save_config(self._config)
 
     def _log(self, msg: str):
+        """Append one or more newline-separated lines to the activity log."""
         self.log.configure(state=tk.NORMAL)
         self.log.insert(tk.END, msg + "\n")
+        if int(self.log.index("end-1c").split(".")[0]) > _LOG_MAX_LINES:
+            self.log.delete("1.0", f"{_LOG_TRIM_LINES + 1}.0")
         self.log.see(tk.END)
         self.log.configure(state=tk.DISABLED)
 
@@ -353,6 +417,7 @@ class PlaylistMP3App:
 
     def _progress_reset(self):
         """Reset progress bar to indeterminate (unknown progress) at start."""
+        self._last_pct = -1.0
         self.progress_label.configure(text="")
         self.progress_bar.configure(mode="indeterminate")
         self.progress_bar.start(8)
@@ -368,7 +433,13 @@ class PlaylistMP3App:
         self.progress_label.configure(text=label)
 
     def _progress_set_percent(self, value: float):
-        """Set progress bar to a 0–100 percentage (determinate)."""
+        """
+        Set progress bar to a 0–100 percentage (determinate). Tiny forward steps are skipped,
+        but 100% and a drop (next file starting) are always shown.
+        """
+        if value < 100.0 and self._last_pct <= value < self._last_pct + _PCT_MIN_DELTA:
+            return
+        self._last_pct = value
         try:
             self.progress_bar.stop()
         except tk.TclError:
@@ -407,7 +478,8 @@ class PlaylistMP3App:
             messagebox.showerror("Could not create folder", str(e))
             return
 
-        save_config(load_config() | {"output_dir": out})
+        self._config["output_dir"] = out
+        save_config(self._config)
 
         self.download_running = True
         self.btn_download.configure(state=tk.DISABLED)
@@ -418,52 +490,148 @@ class PlaylistMP3App:
         self._log("")
 
         bitrate = self.bitrate_var.get().strip()
-        thread = threading.Thread(target=self._run_download, args=(url, out, bitrate), daemon=True)
-        thread.start()
+        self._jobs.put((url, out, bitrate))
+
+    def _poll_queue(self):
+        """Drain worker messages on the Tk thread; log lines are inserted in one batch and only
+        the latest progress values are applied."""
+        lines: list[str] = []
+        pct = None
+        tracks = None
+        done = None
+        try:
+            try:
+                for _ in range(_POLL_BATCH):
+                    kind, payload = self._msg_q.get_nowait()
+                    if kind == "log":
+                        lines.append(payload)
+                    elif kind == "pct":
+                        pct = payload
+                    elif kind == "tracks":
+                        tracks = payload
+                    elif kind == "done":
+                        done = payload
+                    elif kind == "deps":
+                        if payload:
+                            self._show_dependency_dialog(payload)
+            except queue.Empty:
+                pass
+            if lines:
+                self._log("\n".join(lines))
+            if tracks is not None:
+                self._progress_set_tracks(*tracks)
+            if pct is not None:
+                self._progress_set_percent(pct)
+        finally:
+            # A failing update above must not strand the Download button or stop future polling
+            try:
+                if done is not None:
+                    self._download_finished(done)
+            finally:
+                self.root.after(_POLL_MS, self._poll_queue)
+
+    def _worker_loop(self) -> None:
+        """Run queued downloads one at a time on a single background thread."""
+        while True:
+            url, output_dir, bitrate = self._jobs.get()
+            self._run_download(url, output_dir, bitrate)
+
+    def _iter_output_chunks(self, proc: subprocess.Popen) -> Iterator[bytes]:
+        """
+        Yield raw stdout chunks from proc, ending with b"" at EOF.
+        Waits at most _READ_TIMEOUT between Stop checks; returns early once Stop is pressed.
+        """
+        if sys.platform == "win32":
+            # selectors cannot wait on pipes on Windows: read in a helper thread instead
+            chunks: queue.Queue = queue.Queue()
+            stdout = proc.stdout
+
+            def pump() -> None:
+                # Owns the pipe: reads through the file object and closes it at EOF, so the
+                # handle is never closed (or its fd reused) while a read is still blocked.
+                try:
+                    while True:
+                        chunk = stdout.read1(_READ_CHUNK)
+                        chunks.put(chunk)
+                        if not chunk:
+                            return
+                except (OSError, ValueError):
+                    chunks.put(b"")
+                finally:
+                    stdout.close()
+
+            threading.Thread(target=pump, daemon=True).start()
+            while self.download_running:
+                try:
+                    chunk = chunks.get(timeout=_READ_TIMEOUT)
+                except queue.Empty:
+                    continue
+                yield chunk
+                if not chunk:
+                    return
+            return
+
+        fd = proc.stdout.fileno()
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while self.download_running:
+                if not sel.select(timeout=_READ_TIMEOUT):
+                    continue
+                chunk = os.read(fd, _READ_CHUNK)
+                yield chunk
+                if not chunk:
+                    return
 
     def _run_download(self, url: str, output_dir: str, bitrate: str):
-        cmd = build_yt_dlp_command(url, output_dir, bitrate)
         self._playlist_track_progress = PlaylistTrackProgress()
         pt = self._playlist_track_progress
+        q = self._msg_q
         returncode = 0
         try:
+            cmd = build_yt_dlp_command(url, output_dir, bitrate)
             self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
             )
-            for line in self.process.stdout:
-                if not self.download_running:
-                    self.process.terminate()
-                    break
-                line = line.rstrip()
-                if line:
-                    self.root.after(0, lambda l=line: self._log(l))
-                    pt.apply_line(line)
-                    self.root.after(
-                        0,
-                        lambda: self._progress_set_tracks(pt.completed, pt.total),
-                    )
-                    percent = parse_progress_line(line)
-                    if percent is not None:
-                        self.root.after(0, lambda p=percent: self._progress_set_percent(p))
+            tracks = (pt.completed, pt.total)
+            buf = bytearray()
+            for chunk in self._iter_output_chunks(self.process):
+                if chunk:
+                    buf += chunk
+                    lines = _take_lines(buf)
+                else:
+                    # EOF: flush a trailing line without a terminator
+                    lines = _decode_lines(bytes(buf))
+                for line in lines:
+                    line = line.rstrip()
+                    if line:
+                        q.put(("log", line))
+                        pt.apply_line(line)
+                        if (pt.completed, pt.total) != tracks:
+                            tracks = (pt.completed, pt.total)
+                            q.put(("tracks", tracks))
+                        percent = parse_progress_line(line)
+                        if percent is not None:
+                            q.put(("pct", percent))
+            if not self.download_running:
+                self.process.terminate()
             returncode = self.process.wait()
             if returncode == 0:
                 pt.finalize_success()
-                self.root.after(0, lambda: self._progress_set_tracks(pt.completed, pt.total))
+                q.put(("tracks", (pt.completed, pt.total)))
         except FileNotFoundError:
             returncode = -1
-            self.root.after(0, lambda: self._log(
+            q.put((
+                "log",
                 "Error: yt-dlp not found. Run in terminal: pip install -r requirements.txt\n"
-                "Then ensure ffmpeg is installed (e.g. sudo dnf install ffmpeg)."
+                "Then ensure ffmpeg is installed (e.g. sudo dnf install ffmpeg).",
             ))
         except Exception as e:
-            self.root.after(0, lambda: self._log(f"Error: {e}"))
+            q.put(("log", f"Error: {e}"))
             returncode = -1
         finally:
-            self.root.after(0, lambda: self._download_finished(returncode))
+            q.put(("done", returncode))
 
     def _stop_download(self):
         self.download_running = False
@@ -2,6 +2,7 @@
 Shared helpers for GUI and CLI: config, URL checks, yt-dlp command building, progress parsing.
 """
 
+import functools
 import json
 import os
 import re
@@ -21,6 +22,17 @@ QUALITY_MAP = {
     "Best (VBR)": "0",
 }
 
+# Playlist / watch / short links on youtube.com, music.youtube.com and youtu.be
+_YT_URL_RE = re.compile(
+    r"https?://(?:"
+    r"(?:www\.|music\.)?youtube\.com/(?:playlist\?list=[\w-]+|watch\?v=[\w-]+(?:&list=[\w-]+)?)"
+    r"|youtu\.be/[\w-]+"
+    r")"
+)
+
+# yt-dlp per-file progress, e.g. "[download]  42.3% of 3.41MiB at ..."
+_PROGRESS_RE = re.compile(r"\[download\]\s*(\d+(?:\.\d+)?)\s*%")
+
 
 def config_path() -> Path:
     p = Path.home() / ".config" / "yt-playlist-mp3"
@@ -50,55 +62,80 @@ def load_config() -> dict:
 
 
 def save_config(data: dict) -> None:
-    with open(config_path(), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    """Write config atomically (fsynced temp file + replace) so a crash never leaves it truncated."""
+    path = config_path()
+    tmp = path.with_suffix(".json.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def is_youtube_url(text: str) -> bool:
-    text = (text or "").strip()
-    if not text:
-        return False
-    patterns = [
-        r"https?://(www\.)?youtube\.com/playlist\?list=[\w-]+",
-        r"https?://(www\.)?youtube\.com/watch\?v=[\w-]+(&list=[\w-]+)?",
-        r"https?://youtu\.be/[\w-]+",
-        r"https?://music\.youtube\.com/playlist\?list=[\w-]+",
-        r"https?://music\.youtube\.com/watch\?v=[\w-]+(&list=[\w-]+)?",
-    ]
-    return any(re.match(p, text) for p in patterns)
-
-
-def get_yt_dlp_cmd() -> list:
-    """Return list of command parts to run yt-dlp: [exe] or [python, '-m', 'yt_dlp']."""
-    exe = "yt-dlp"
-    if sys.platform == "win32":
-        exe = "yt-dlp.exe"
-    for p in os.environ.get("PATH", "").split(os.pathsep):
-        candidate = os.path.join(p, exe)
-        if os.path.isfile(candidate):
-            return [candidate]
+    return bool(_YT_URL_RE.match((text or "").strip()))
+
+
+def _yt_dlp_exe_name() -> str:
+    return "yt-dlp.exe" if sys.platform == "win32" else "yt-dlp"
+
+
+@functools.lru_cache(maxsize=1)
+def _find_yt_dlp_cmd() -> Optional[tuple[str, ...]]:
+    exe = _yt_dlp_exe_name()
+    found = shutil.which(exe)
+    if found:
+        return (found,)
     script_dir = Path(__file__).resolve().parent
     candidate = script_dir / exe
     if candidate.is_file():
-        return [str(candidate)]
+        return (str(candidate),)
     try:
         import yt_dlp  # noqa: F401
 
-        return [sys.executable, "-m", "yt_dlp"]
+        return (sys.executable, "-m", "yt_dlp")
     except ImportError:
         pass
-    return [exe]
+    return None
 
 
-def get_js_runtime_args() -> list:
-    """Return yt-dlp args for a JS runtime. Deno is default; if missing, use node or bun."""
-    if shutil.which("deno"):
-        return []
-    if shutil.which("node"):
-        return ["--js-runtimes", "node"]
-    if shutil.which("bun"):
-        return ["--js-runtimes", "bun"]
-    return []
+def get_yt_dlp_cmd() -> tuple[str, ...]:
+    """
+    Return command parts to run yt-dlp: (exe,) or (python, '-m', 'yt_dlp').
+    A found command is cached per process; a miss is probed again on the next call
+    so installing yt-dlp while the app is running takes effect.
+    """
+    cmd = _find_yt_dlp_cmd()
+    if cmd is None:
+        _find_yt_dlp_cmd.cache_clear()
+        return (_yt_dlp_exe_name(),)
+    return cmd
+
+
+@functools.lru_cache(maxsize=1)
+def _find_js_runtime() -> Optional[str]:
+    for name in ("deno", "node", "bun"):
+        if shutil.which(name):
+            return name
+    return None
+
+
+def get_js_runtime_args() -> tuple[str, ...]:
+    """
+    Return yt-dlp args for a JS runtime. Deno is default; if missing, use node or bun.
+    A found runtime is cached per process; a miss is probed again on the next call.
+    """
+    runtime = _find_js_runtime()
+    if runtime is None:
+        _find_js_runtime.cache_clear()
+        return ()
+    if runtime == "deno":
+        return ()
+    return ("--js-runtimes", runtime)
 
 
 def bitrate_to_quality(bitrate_label: str) -> str:
@@ -113,7 +150,7 @@ def build_yt_dlp_command(url: str, output_dir: str, bitrate_label: str) -> list:
     )
     return (
         list(get_yt_dlp_cmd())
-        + get_js_runtime_args()
+        + list(get_js_runtime_args())
         + [
             "-x",
             "--audio-format",
@@ -133,10 +170,12 @@ def build_yt_dlp_command(url: str, output_dir: str, bitrate_label: str) -> list:
 
 def parse_progress_line(line: str) -> Optional[float]:
     """Extract download percentage from a yt-dlp progress line. Returns 0–100 or None."""
-    m = re.search(r"\[download\]\s*(\d+(?:\.\d+)?)\s*%", line)
-    if m:
-        return float(m.group(1))
-    return None
+    line = line.lstrip()
+    # Cheap prefix check first: most yt-dlp output (ffmpeg, info, warnings) is not progress
+    if not line.startswith("[download]"):
+        return None
+    m = _PROGRESS_RE.match(line)
+    return float(m.group(1)) if m else None
 
 
 @dataclass